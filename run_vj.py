@@ -18,10 +18,19 @@ def parse_args():
     p.add_argument("--blocksize", type=int, default=1024)
     p.add_argument("--samplerate", type=int, default=None)
     p.add_argument("--device", type=int, default=None, help="Index PortAudio du périphérique à utiliser (voir --list-devices)")
+    p.add_argument("--latency", default="low", help="Latence PortAudio en entrée: 'low', 'high' ou secondes (défaut: low)")
     p.add_argument("--list-devices", action="store_true", help="Lister les périphériques audio (PortAudio) et quitter")
     return p.parse_args()
 
 
+def _parse_latency(value):
+    """'low'/'high' tels quels, sinon une durée en secondes."""
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
 def main():
     args = parse_args()
     if getattr(args, 'list_devices', False):
@@ -53,8 +62,10 @@ def main():
             return
     else:
         cfg = Config(device=args.device, blocksize=args.blocksize, samplerate=args.samplerate)
+    cfg.latency = _parse_latency(args.latency)
 
-    analyzer = AudioAnalyzer(blocksize=cfg.blocksize, samplerate=cfg.samplerate, device=cfg.device)
+    analyzer = AudioAnalyzer(blocksize=cfg.blocksize, samplerate=cfg.samplerate, device=cfg.device,
+                             latency=cfg.latency)
 
     try:
         analyzer.start()
@@ -3,6 +3,7 @@
 Fournit des helpers pour lister les périphériques PortAudio et un petit
 dataclass `Config` pour transporter les options courantes.
 """
+import time
 from typing import Optional, List, Dict
 
 _sd_import_err = None
@@ -12,6 +13,10 @@ except Exception as e:
     sd = None
     _sd_import_err = e
 
+# sd.query_devices() can take hundreds of ms (Windows/WASAPI): cache it
+_DEVICES_TTL = 5.0
+_dev_cache = {"t": 0.0, "v": None, "names": {}}
+
 
 class Config:
     def __init__(self, device: Optional[int] = None, blocksize: int = 1024,
@@ -19,7 +24,8 @@ class Config:
                  primary_color: Optional[tuple] = None,
                  secondary_color: Optional[tuple] = None,
                  bg_color: Optional[tuple] = None,
-                 glitch_enabled: bool = True):
+                 glitch_enabled: bool = True,
+                 latency="low"):
         self.device = device
         self.blocksize = blocksize
         self.samplerate = samplerate
@@ -28,6 +34,28 @@ class Config:
         self.secondary_color = secondary_color
         self.bg_color = bg_color
         self.glitch_enabled = glitch_enabled
+        # PortAudio input latency: 'low', 'high' or seconds (float)
+        self.latency = latency
+
+
+def _query_devices():
+    """Retourne `sd.query_devices()`, mis en cache pendant `_DEVICES_TTL` s."""
+    now = time.monotonic()
+    if _dev_cache["v"] is None or now - _dev_cache["t"] >= _DEVICES_TTL:
+        _dev_cache["v"] = sd.query_devices()
+        _dev_cache["t"] = now
+        _dev_cache["names"] = {}
+    return _dev_cache["v"]
+
+
+def invalidate_devices() -> None:
+    """Vide le cache des périphériques (ex. après un branchement à chaud).
+
+    La prochaine énumération interrogera de nouveau PortAudio.
+    """
+    _dev_cache["v"] = None
+    _dev_cache["t"] = 0.0
+    _dev_cache["names"] = {}
 
 
 def list_devices(outputs_only: bool = True) -> List[Dict]:
@@ -36,11 +64,12 @@ def list_devices(outputs_only: bool = True) -> List[Dict]:
     Par défaut (outputs_only=True) on renvoie les périphériques qui fournissent
     des canaux de sortie (max_output_channels > 0) afin de permettre la
     sélection des périphériques de lecture. Passez outputs_only=False pour
-    obtenir la liste complète.
+    obtenir la liste complète. Le résultat de PortAudio est mis en cache
+    quelques secondes, voir `invalidate_devices()`.
     """
     if sd is None:
         raise RuntimeError(f"sounddevice non disponible: {_sd_import_err}")
-    devs = sd.query_devices()
+    devs = _query_devices()
     if not outputs_only:
         # annotate with their PortAudio index for callers that expect it
         for i, d in enumerate(devs):
@@ -55,15 +84,26 @@ def list_devices(outputs_only: bool = True) -> List[Dict]:
     return out
 
 
+def device_labels(devs: List[Dict]) -> List[str]:
+    """Libellés "index: nom  in=.. out=.." d'une liste de périphériques.
+
+    Utilise l'index PortAudio `_pa_index` posé par `list_devices`, sinon la
+    position dans `devs`.
+    """
+    return [f"{d.get('_pa_index', i)}: {d['name']}  in={d['max_input_channels']} out={d['max_output_channels']}"
+            for i, d in enumerate(devs)]
+
+
 def format_devices(outputs_only: bool = True) -> List[str]:
     """Helper: liste des noms + indices formatés pour affichage.
 
     Par défaut, n'affiche que les périphériques de sortie. Passer
-    `outputs_only=False` pour lister tous les périphériques.
+    `outputs_only=False` pour lister tous les périphériques. Les lignes sont
+    mémorisées avec le cache des périphériques.
     """
     devs = list_devices(outputs_only=outputs_only)
-    lines = []
-    for i, d in enumerate(devs):
-        pa_idx = d.get('_pa_index', i)
-        lines.append(f"{pa_idx}: {d['name']}  in={d['max_input_channels']} out={d['max_output_channels']}")
+    lines = _dev_cache["names"].get(outputs_only)
+    if lines is None:
+        lines = device_labels(devs)
+        _dev_cache["names"][outputs_only] = lines
     return lines
@@ -4,10 +4,13 @@ Expose an `AudioAnalyzer` class with a minimal API:
 - start(source=None, mic=False)
 - stop()
 - attributes: latest_spectrum, latest_rms
+- read_latest() -> (spectrum copy, rms), consistent without locking
 
 This module intentionally keeps audio I/O separate from rendering.
 """
 from typing import Optional
+import functools
+import math
 import threading
 import queue
 import time
@@ -29,63 +32,253 @@ try:
 except Exception as e:
     sf = None
     _sf_import_err = e
+# scipy's pocketfft is faster than numpy.fft for repeated fixed-size
+# transforms; optional, numpy.fft is used when scipy is missing
+try:
+    import scipy.fft as _scipy_fft
+except Exception:
+    _scipy_fft = None
+# numba is optional: fuses the per-frame passes into single compiled loops
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+
+@functools.lru_cache(maxsize=8)
+def _window(kind: str, n: int, dtype: str = "float32"):
+    """Fenêtre d'analyse partagée, en lecture seule, mise en cache par (kind, n, dtype).
+
+    kind: 'hann', 'hamming' ou 'blackman'.
+    """
+    make = {"hann": np.hanning, "hamming": np.hamming, "blackman": np.blackman}[kind]
+    w = make(n).astype(dtype)
+    w.setflags(write=False)
+    return w
+
+
+def _window_and_rms_np(frame, win, out):
+    """Write frame*win into `out` and return the RMS of `frame`."""
+    np.multiply(frame, win, out=out)
+    return math.sqrt(float(np.dot(frame, frame)) / len(frame))
+
+
+def _downmix_stereo_np(indata, out):
+    """Average the two channels of `indata` into `out` (no temporary)."""
+    np.add(indata[:, 0], indata[:, 1], out=out)
+    out *= 0.5
+    return out
+
+
+def _downmix_n_np(indata, out):
+    """Average all channels of `indata` into `out`."""
+    return np.mean(indata, axis=1, out=out)
+
+
+def _abs_normalize_np(cspec, out):
+    """Write |cspec| / max(|cspec|) into `out` and return it."""
+    np.abs(cspec, out=out)
+    # one reduce + one in-place multiply by the reciprocal (no division pass)
+    out *= np.float32(1.0 / (float(out.max()) + 1e-6))
+    return out
+
+
+if njit is not None:
+    # definition and warm-up share the try: @njit(cache=True) itself can
+    # raise (no cache locator when frozen), which must also fall back
+    try:
+        @njit(cache=True, fastmath=True)
+        def _window_and_rms(frame, win, out):
+            """Same as `_window_and_rms_np`, in one pass over the buffer."""
+            n = frame.shape[0]
+            s = 0.0
+            for i in range(n):
+                v = frame[i]
+                out[i] = v * win[i]
+                s += v * v
+            return math.sqrt(s / n)
+
+        @njit(cache=True, fastmath=True)
+        def _downmix_stereo(indata, out):
+            """Same as `_downmix_stereo_np`."""
+            for i in range(out.shape[0]):
+                out[i] = 0.5 * (indata[i, 0] + indata[i, 1])
+            return out
+
+        @njit(cache=True, fastmath=True)
+        def _downmix_n(indata, out):
+            """Same as `_downmix_n_np`."""
+            ch = indata.shape[1]
+            inv = 1.0 / ch
+            for i in range(out.shape[0]):
+                s = 0.0
+                for c in range(ch):
+                    s += indata[i, c]
+                out[i] = s * inv
+            return out
+
+        @njit(cache=True, fastmath=True)
+        def _abs_normalize(cspec, out):
+            """Same as `_abs_normalize_np`: magnitude + max scan, then scale."""
+            n = cspec.shape[0]
+            m = 0.0
+            for i in range(n):
+                c = cspec[i]
+                a = math.sqrt(c.real * c.real + c.imag * c.imag)
+                out[i] = a
+                if a > m:
+                    m = a
+            inv = 1.0 / (m + 1e-6)
+            for i in range(n):
+                out[i] *= inv
+            return out
+
+        # compile now (or load from cache) so the audio thread never pays JIT cost
+        _w = np.zeros(1024, dtype=np.float32)
+        # the window argument is the shared read-only array from _window()
+        _window_and_rms(_w, _window("hann", 1024), np.empty_like(_w))
+        _downmix_stereo(np.zeros((1024, 2), dtype=np.float32), _w)
+        _downmix_n(np.zeros((1024, 3), dtype=np.float32), _w)
+        # the complex dtype _analyze_frame's rfft actually returns for float32
+        # input (numpy>=2 keeps complex64, older numpy widens to complex128)
+        _rfft = _scipy_fft.rfft if _scipy_fft is not None else np.fft.rfft
+        _c = np.zeros(513, dtype=_rfft(_w).dtype)
+        _abs_normalize(_c, np.empty(513, dtype=np.float32))
+        del _w, _c, _rfft
+    except Exception:
+        njit = None
+if njit is None:
+    _window_and_rms = _window_and_rms_np
+    _downmix_stereo = _downmix_stereo_np
+    _downmix_n = _downmix_n_np
+    _abs_normalize = _abs_normalize_np
 
 
 
 class AudioAnalyzer:
     """Capture live du périphérique audio (entrée micro) et calcul FFT."""
-    def __init__(self, blocksize: int = 1024, samplerate: Optional[int] = None, device: Optional[int] = None):
+    def __init__(self, blocksize: int = 1024, samplerate: Optional[int] = None, device: Optional[int] = None,
+                 latency="low"):
         self.blocksize = blocksize
         self.samplerate = samplerate
         self.device = device
-        self._spec_lock = threading.Lock()
-        self.latest_spectrum = np.zeros(blocksize // 2)
+        # PortAudio's default ('high') buffers ~30 ms on ALSA; 'low' uses the
+        # device's default low input latency
+        self.latency = latency
+        # float32 spectrum, double-buffered: the writer fills the inactive
+        # buffer then swaps the reference; _version counts publications so
+        # readers can detect a concurrent update (see read_latest)
+        self._spec_bufs = (np.zeros(blocksize // 2, dtype=np.float32),
+                           np.zeros(blocksize // 2, dtype=np.float32))
+        self.latest_spectrum = self._spec_bufs[0]
         self.latest_rms = 0.0
+        self._version = 0
+        # blocksize is fixed: window and scratch buffers are allocated once
+        self._win = _window("hann", blocksize)
+        self._frame_buf = np.empty(blocksize, dtype=np.float32)
+        self._mono = np.empty(blocksize, dtype=np.float32)
+        self._mag_buf = np.empty(blocksize // 2 + 1, dtype=np.float32)
+        # audio callback -> analysis worker handoff: the callback only copies
+        # the mono block into _pending and signals; the worker runs the FFT
+        self._pending = np.zeros(blocksize, dtype=np.float32)
+        self._work = np.empty(blocksize, dtype=np.float32)
+        self._pending_ev = threading.Event()
+        self._worker = None
         self._stop = threading.Event()
         self._stream = None
 
+    def _downmix(self, indata, out):
+        """Mono copy of a (frames, channels) block into the preallocated `out`."""
+        ch = indata.shape[1]
+        if ch == 1:
+            np.copyto(out, indata[:, 0])
+        elif ch == 2:
+            _downmix_stereo(indata, out)
+        else:
+            _downmix_n(indata, out)
+        return out
+
     def _analyze_frame(self, frame):
         if frame.ndim > 1:
-            frame = np.mean(frame, axis=1)
-        win = np.hanning(len(frame))
-        frame_win = frame * win
-        spec = np.abs(np.fft.rfft(frame_win))
-        spec = spec / (np.max(spec) + 1e-6)
-        rms = float(np.sqrt(np.mean(frame ** 2)))
-        with self._spec_lock:
-            target_len = self.blocksize // 2
-            if len(spec) != target_len:
-                spec = np.resize(spec, target_len)
-            self.latest_spectrum = spec
-            self.latest_rms = rms
+            frame = self._downmix(frame, self._mono)
+        # frames are always blocksize long (see _mic_callback)
+        rms = _window_and_rms(frame, self._win, self._frame_buf)
+        if _scipy_fft is not None:
+            cspec = _scipy_fft.rfft(self._frame_buf, workers=1, overwrite_x=True)
+        else:
+            cspec = np.fft.rfft(self._frame_buf)
+        spec = _abs_normalize(cspec, self._mag_buf)
+        a, b = self._spec_bufs
+        buf = b if self.latest_spectrum is a else a
+        # spectrum length is blocksize//2 (drop the Nyquist bin)
+        buf[:] = spec[: self.blocksize // 2]
+        self.latest_spectrum = buf
+        self.latest_rms = rms
+        self._version += 1
+
+    def read_latest(self):
+        """Retourne (copie de latest_spectrum, latest_rms) sans verrou.
+
+        Seqlock: on relit si une publication a eu lieu pendant la copie
+        (rare, l'analyse tourne à ~40-90 Hz).
+        """
+        for _ in range(4):
+            v = self._version
+            spec = self.latest_spectrum.copy()
+            rms = self.latest_rms
+            if self._version == v:
+                break
+        return spec, rms
 
     def _mic_callback(self, indata, frames, time_info, status):
         try:
+            # the stream is opened with blocksize=self.blocksize, so PortAudio
+            # always delivers exactly that many frames
+            if frames != self.blocksize:
+                return
+            # no FFT nor allocation here: hand the block to the worker
             if indata.ndim > 1:
-                mono = np.mean(indata, axis=1)
+                self._downmix(indata, self._pending)
             else:
-                mono = indata
-            if len(mono) != self.blocksize:
-                if len(mono) > self.blocksize:
-                    mono = mono[: self.blocksize]
-                else:
-                    mono = np.pad(mono, (0, self.blocksize - len(mono)))
-            self._analyze_frame(mono)
+                np.copyto(self._pending, indata)
+            self._pending_ev.set()
         except Exception:
             pass
 
+    def _analyze_pending(self):
+        """Analyse le dernier bloc déposé par le callback audio."""
+        np.copyto(self._work, self._pending)
+        self._analyze_frame(self._work)
+
+    def _analyze_loop(self):
+        """Thread d'analyse: traite les blocs signalés par `_mic_callback`."""
+        while not self._stop.is_set():
+            if not self._pending_ev.wait(timeout=0.2):
+                continue
+            self._pending_ev.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self._analyze_pending()
+            except Exception:
+                pass
+
     def start(self):
         """Démarre la capture live (entrée micro/périphérique)."""
         self._stop.clear()
         if sd is None:
             raise RuntimeError(f"sounddevice non disponible: {_sd_import_err}")
         samplerate = self.samplerate or sd.query_devices(self.device, 'input')['default_samplerate']
+        self._worker = threading.Thread(target=self._analyze_loop, daemon=True)
+        self._worker.start()
         try:
             self._stream = sd.InputStream(samplerate=int(samplerate), blocksize=self.blocksize,
                                           device=self.device, channels=1,
+                                          latency=self.latency,
                                           callback=self._mic_callback)
             self._stream.start()
         except Exception as e:
+            self.stop()
             raise
 
     def stop(self):
@@ -99,4 +292,8 @@ class AudioAnalyzer:
                     pass
                 self._stream = None
         finally:
-            pass
+            # wake the analysis worker so it sees the stop flag
+            self._pending_ev.set()
+            if self._worker is not None:
+                self._worker.join(timeout=0.5)
+                self._worker = None
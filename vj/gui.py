@@ -1,12 +1,86 @@
 """Module GUI: rendering du visualizer avec pygame.
 
-La GUI lit `analyzer.latest_spectrum` et `analyzer.latest_rms` et les
-affiche. L'API principale est `VisualGUI(analyzer).run()`.
+La GUI lit `analyzer.latest_spectrum` et `analyzer.latest_rms` (via
+`analyzer.read_latest()`) et les affiche. L'API principale est
+`VisualGUI(analyzer).run()`.
 """
 import math
 from collections import deque
 from typing import Optional
 
+import numpy as np
+
+_pygame_import_err = None
+try:
+    import pygame
+except Exception as e:
+    pygame = None
+    _pygame_import_err = e
+
+# numba is optional: when present the per-frame band statistics are JIT-compiled
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+
+def _frame_stats_np(spec, b1, b2, ema_low, ema_mid, ema_high, alpha):
+    """Band energies of `spec` and their EMA update (NumPy implementation).
+
+    Returns (low_energy, low_norm, mid_norm, high_norm, ema_low, ema_mid, ema_high).
+    """
+    n = len(spec)
+    # one reduction pass for the three bands instead of three slice sums
+    sums = np.add.reduceat(spec, np.array([0, b1, b2]))
+    widths = np.array([b1, max(1, b2 - b1), max(1, n - b2)], dtype=np.float32)
+    low_energy, mid_energy, high_energy = (float(v) for v in sums / widths)
+    total = low_energy + mid_energy + high_energy + 1e-9
+    # normalized
+    low_norm = low_energy / total
+    mid_norm = mid_energy / total
+    high_norm = high_energy / total
+    return (low_energy, low_norm, mid_norm, high_norm,
+            (1.0 - alpha) * ema_low + alpha * low_norm,
+            (1.0 - alpha) * ema_mid + alpha * mid_norm,
+            (1.0 - alpha) * ema_high + alpha * high_norm)
+
+
+if njit is not None:
+    # decorating may fail too (e.g. no cache locator in a frozen app):
+    # keep it inside the try so any numba failure falls back to NumPy
+    try:
+        @njit(cache=True, fastmath=True)
+        def _frame_stats(spec, b1, b2, ema_low, ema_mid, ema_high, alpha):
+            """Same as `_frame_stats_np`, as a single compiled pass over `spec`."""
+            n = spec.shape[0]
+            low = 0.0
+            mid = 0.0
+            high = 0.0
+            for i in range(b1):
+                low += spec[i]
+            for i in range(b1, b2):
+                mid += spec[i]
+            for i in range(b2, n):
+                high += spec[i]
+            low /= b1
+            mid /= max(1, b2 - b1)
+            high /= max(1, n - b2)
+            total = low + mid + high + 1e-9
+            low_norm = low / total
+            mid_norm = mid / total
+            high_norm = high / total
+            return (low, low_norm, mid_norm, high_norm,
+                    (1.0 - alpha) * ema_low + alpha * low_norm,
+                    (1.0 - alpha) * ema_mid + alpha * mid_norm,
+                    (1.0 - alpha) * ema_high + alpha * high_norm)
+
+        # compile now (or load from cache) so the first frame never pays JIT cost
+        _frame_stats(np.zeros(512, dtype=np.float32), 64, 170, 0.0, 0.0, 0.0, 0.18)
+    except Exception:
+        njit = None
+if njit is None:
+    _frame_stats = _frame_stats_np
+
 
 class VisualGUI:
     def __init__(self, analyzer, width: int = 800, height: int = 600, title: Optional[str] = None,
@@ -19,17 +93,28 @@ class VisualGUI:
         self._stop = False
         # Pour fond animé et particules
         self._bg_phase = 0.0
-        self._particles = []  # chaque particule: [x, y, vx, vy, color, life]
-        # lasers: chaque laser [x1,y1,x2,y2, vx, vy, color, life]
-        self._lasers = []
+        # quiet fast path (see _draw): rms threshold, quiet frame count, cached frame
+        self._quiet_rms = 0.005
+        self._quiet_frames = 0
+        self._last_frame = None
         # glitch / overlays
         self._glitch_timer = 0
         self._glitch_enabled = bool(glitch_enabled)
         # backgrounds parameters (populated at run-time)
         self._bg_surfaces = []
         self._bg_sel_phase = 0.0
+        # full-window SRCALPHA surfaces reused every frame (see _init_surfaces)
+        self._tint_surf = None
+        self._glow_surf = None
+        self._scanlines_surf = None
+        # rotozoomed backgrounds keyed by (idx, angle bucket, zoom bucket), FIFO-bounded
+        self._rotozoom_cache = {}
+        self._rotozoom_cache_size = 16
         # beat / rhythm helpers
         self._rms_history = deque(maxlen=60)
+        # running sum / sum of squares of _rms_history (O(1) mean/std)
+        self._rms_sum = 0.0
+        self._rms_sqsum = 0.0
         self._beat_cooldown = 0
         self._last_beat = False
         # scene and smoothing
@@ -37,9 +122,33 @@ class VisualGUI:
         self._scene_timer = 0
         self._band_ema = {"low": 0.0, "mid": 0.0, "high": 0.0}
         self._ema_alpha = 0.18
+        # dedicated generator; scalar draws come from a pooled batch (see _rand)
+        self._rng = np.random.default_rng()
+        self._rand_pool = []
+        self._rand_idx = 0
+        # cos/sin lookup tables per spectrum length: n -> (cos, sin)
+        self._trig_cache = {}
         # performance caps
         self._max_particles = 800
+        # particles as struct-of-arrays; slots [0, _pcount) are alive
+        self._pcount = 0
+        self._px = np.zeros(self._max_particles, dtype=np.float32)
+        self._py = np.zeros(self._max_particles, dtype=np.float32)
+        self._pvx = np.zeros(self._max_particles, dtype=np.float32)
+        self._pvy = np.zeros(self._max_particles, dtype=np.float32)
+        self._plife = np.zeros(self._max_particles, dtype=np.float32)
+        self._pcolor = np.zeros((self._max_particles, 3), dtype=np.uint8)
         self._max_lasers = 120
+        # lasers as struct-of-arrays; slots [0, _lcount) are alive
+        self._lcount = 0
+        self._lx1 = np.zeros(self._max_lasers, dtype=np.float32)
+        self._ly1 = np.zeros(self._max_lasers, dtype=np.float32)
+        self._lx2 = np.zeros(self._max_lasers, dtype=np.float32)
+        self._ly2 = np.zeros(self._max_lasers, dtype=np.float32)
+        self._lvx = np.zeros(self._max_lasers, dtype=np.float32)
+        self._lvy = np.zeros(self._max_lasers, dtype=np.float32)
+        self._llife = np.zeros(self._max_lasers, dtype=np.float32)
+        self._lcolor = np.zeros((self._max_lasers, 3), dtype=np.uint8)
         # visibility multiplier for lasers (can be changed per scene)
         self._laser_vis = 1.0
         # color palettes and background cycling
@@ -50,6 +159,8 @@ class VisualGUI:
             ((255, 240, 120), (160, 60, 200), (140, 255, 180)), # warm neon mix
         ]
         self._palette_index = 0
+        # (n, palette_index) -> int16 palette array + per-bin palette index
+        self._pal_lut = None
         self._palette_timer = 0
         # apply user-specified colors if present (primary/secondary/background)
         if primary_color or secondary_color or bg_color:
@@ -62,13 +173,25 @@ class VisualGUI:
             self._palettes.insert(0, p)
 
     def _draw(self, screen):
-        import pygame
-        import random
-        with self.analyzer._spec_lock:
-            spec = self.analyzer.latest_spectrum.copy()
-            rms = float(self.analyzer.latest_rms)
+        spec, rms = self.analyzer.read_latest()
+        rms = float(rms)
+        spec = np.ascontiguousarray(spec, dtype=np.float32)
+        if self._tint_surf is None:
+            self._init_surfaces()
+
+        # quiet fast path: silence with nothing left animating -> re-show the last frame
+        quiet = rms < self._quiet_rms
+        if quiet and self._pcount == 0 and self._lcount == 0 and self._glitch_timer == 0:
+            self._quiet_frames += 1
+        else:
+            self._quiet_frames = 0
+        if self._quiet_frames > 3 and self._last_frame is not None:
+            screen.blit(self._last_frame, (0, 0))
+            pygame.display.flip()
+            return
 
         n = len(spec)
+        cs, sn = self._trig(n)
         center = (self.width // 2, self.height // 2)
         max_radius = min(self.width, self.height) // 2 - 20
 
@@ -76,19 +199,24 @@ class VisualGUI:
         # split spectrum into three bands
         b1 = max(1, n // 8)
         b2 = max(1, n // 3)
-        low_energy = float(spec[:b1].sum()) / b1
-        mid_energy = float(spec[b1:b2].sum()) / max(1, (b2 - b1))
-        high_energy = float(spec[b2:].sum()) / max(1, (n - b2))
-        total = low_energy + mid_energy + high_energy + 1e-9
-        # normalized
-        low_norm = low_energy / total
-        mid_norm = mid_energy / total
-        high_norm = high_energy / total
+        # band energies + EMA smoothing in one call (numba-compiled if available)
+        ema = self._band_ema
+        (low_energy, low_norm, mid_norm, high_norm,
+         ema['low'], ema['mid'], ema['high']) = _frame_stats(
+            spec, b1, b2, ema['low'], ema['mid'], ema['high'], self._ema_alpha)
 
         # simple beat detection on RMS: detect when RMS jumps above running mean+std
+        if len(self._rms_history) == self._rms_history.maxlen:
+            # the append below evicts the oldest value
+            old = self._rms_history[0]
+            self._rms_sum -= old
+            self._rms_sqsum -= old * old
         self._rms_history.append(rms)
-        mean_rms = sum(self._rms_history) / len(self._rms_history)
-        var = sum((x - mean_rms) ** 2 for x in self._rms_history) / len(self._rms_history)
+        self._rms_sum += rms
+        self._rms_sqsum += rms * rms
+        N = len(self._rms_history)
+        mean_rms = self._rms_sum / N
+        var = max(0.0, self._rms_sqsum / N - mean_rms * mean_rms)
         std_rms = math.sqrt(var)
         is_beat = False
         if self._beat_cooldown <= 0 and rms > mean_rms + max(0.002, 1.5 * std_rms):
@@ -101,43 +229,34 @@ class VisualGUI:
         if is_beat:
             # bass-directed laser burst
             burst_count = 3 + int(low_norm * 6)
-            for j in range(burst_count):
-                a = random.random() * math.tau
-                x1 = center[0] + int((max_radius * 0.15) * math.cos(a))
-                y1 = center[1] + int((max_radius * 0.15) * math.sin(a))
-                x2 = center[0] + int((max_radius) * math.cos(a))
-                y2 = center[1] + int((max_radius) * math.sin(a))
-                # alternate red/green lasers based on index
-                if j % 2 == 0:
-                    color = (255, 30 + int(220 * low_norm), 60)
-                else:
-                    color = (30, 200, 30 + int(120 * low_norm))
-                self._lasers.append([x1, y1, x2, y2, math.cos(a) * (6 + low_norm * 6), math.sin(a) * (6 + low_norm * 6), color, 30 + int(low_norm * 40)])
+            angs = self._rng.random(burst_count, dtype=np.float32) * np.float32(math.tau)
+            ca, sa = np.cos(angs), np.sin(angs)
+            x1 = center[0] + ((max_radius * 0.15) * ca).astype(np.int32)
+            y1 = center[1] + ((max_radius * 0.15) * sa).astype(np.int32)
+            x2 = center[0] + (max_radius * ca).astype(np.int32)
+            y2 = center[1] + (max_radius * sa).astype(np.int32)
+            # alternate red/green lasers based on index
+            colors = np.empty((burst_count, 3), dtype=np.int16)
+            colors[0::2] = (255, 30 + int(220 * low_norm), 60)
+            colors[1::2] = (30, 200, 30 + int(120 * low_norm))
+            speed = 6 + low_norm * 6
+            self._spawn_lasers(x1, y1, x2, y2, ca * speed, sa * speed, colors,
+                               np.full(burst_count, 30 + int(low_norm * 40), dtype=np.float32))
             # punch visual accents (no text) and extend scene timer
             self._scene_timer = max(self._scene_timer, 40)
 
         # --- FOND MULTI-IMAGE ANIMÉ ---
-        # compute a low-frequency energy to drive background transitions
-        k = max(1, n // 8)
-        try:
-            low_energy = float(spec[:k].sum()) / k
-        except Exception:
-            low_energy = float(sum(spec[:k])) / k
+        # low_energy (computed above) drives background transitions
         # advance bg phases (faster, beat-influenced)
         self._bg_phase += 0.02 + rms * 0.08
         self._bg_sel_phase += 0.02 + low_energy * 0.12
         # force occasional immediate bg jump on strong beats
-        if is_beat and random.random() < 0.5:
+        if is_beat and self._rand() < 0.5:
             # jump between 1 and 3 steps to change scene quickly
-            self._bg_sel_phase += 1.0 + random.random() * 2.0
-
-        # --- update EMA smoothed band values ---
-        self._band_ema['low'] = (1.0 - self._ema_alpha) * self._band_ema['low'] + self._ema_alpha * low_norm
-        self._band_ema['mid'] = (1.0 - self._ema_alpha) * self._band_ema['mid'] + self._ema_alpha * mid_norm
-        self._band_ema['high'] = (1.0 - self._ema_alpha) * self._band_ema['high'] + self._ema_alpha * high_norm
+            self._bg_sel_phase += 1.0 + self._rand() * 2.0
 
         # --- scene manager: change scene occasionally on beats or phase ---
-        if is_beat and random.random() < 0.33:
+        if is_beat and self._rand() < 0.33:
             self._scene_index = (self._scene_index + 1) % 4
             self._scene_timer = 90
         if self._scene_timer > 0:
@@ -153,6 +272,8 @@ class VisualGUI:
         else:
             self._laser_vis = 1.2 + self._band_ema['high'] * 2.0
 
+        # RGBA of the additive tint/flash overlay
+        tint = [0, 0, 0, 0]
         if not self._bg_surfaces:
             # fallback: draw a simple banded gradient if backgrounds missing
             bg = pygame.Surface((self.width, self.height))
@@ -174,10 +295,8 @@ class VisualGUI:
             # animate offsets/rotation
             a1 = (self._bg_phase * 10) % 360
             a2 = (-self._bg_phase * 8) % 360
-            s1 = self._bg_surfaces[idx]
-            s2 = self._bg_surfaces[idx2]
-            r1 = pygame.transform.rotozoom(s1, a1, 1.0 + 0.02 * math.sin(self._bg_phase))
-            r2 = pygame.transform.rotozoom(s2, a2, 1.0 + 0.02 * math.cos(self._bg_phase))
+            r1 = self._rotozoom_bg(idx, a1, 1.0 + 0.02 * math.sin(self._bg_phase))
+            r2 = self._rotozoom_bg(idx2, a2, 1.0 + 0.02 * math.cos(self._bg_phase))
             # center-blit and crossfade according to low_energy
             bx = (self.width - r1.get_width()) // 2
             by = (self.height - r1.get_height()) // 2
@@ -193,158 +312,268 @@ class VisualGUI:
             # choose tint intensity based on low and mid energy
             tint_strength = min(200, int(60 + 380 * (0.6 * self._band_ema['low'] + 0.4 * self._band_ema['mid'])))
             tint_col = pal[int((self._bg_sel_phase) % len(pal))]
-            tint_surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            tint_surf.fill((tint_col[0], tint_col[1], tint_col[2], tint_strength))
-            screen.blit(tint_surf, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            tint = [tint_col[0], tint_col[1], tint_col[2], tint_strength]
 
         # --- FLASH SYNCHRO BEAT --- (colored) using palette
         if rms > 0.12:
             alpha = min(255, int((rms - 0.12) * 1200))
-            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
             pal = self._palettes[self._palette_index]
             # pulse between palette entries for variety (use scene/phase)
             cidx = (self._scene_index + int(self._bg_phase)) % len(pal)
             pc = pal[cidx]
-            overlay.fill((pc[0], pc[1]//2, pc[2], alpha))
-            screen.blit(overlay, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            for ch, v in enumerate((pc[0], pc[1]//2, pc[2], alpha)):
+                tint[ch] += v
+        # tint and flash are both additive: fused into a single full-screen blit
+        if any(tint):
+            self._tint_surf.fill(tuple(min(255, v) for v in tint))
+            screen.blit(self._tint_surf, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
 
         # --- PARTICULES RÉACTIVES AU SPECTRE + LASERS ---
-        for i, mag in enumerate(spec):
-            if mag > 0.65 and random.random() < mag * 0.25:
-                angle = 2 * math.pi * i / n
+        # nothing new spawns in silence so the scene can settle (quiet fast path)
+        if not quiet:
+            # bins selected with one random draw per bin, angles from the trig tables
+            idx = np.nonzero((spec > 0.65) & (self._rng.random(n, dtype=np.float32) < spec * 0.25))[0]
+            if len(idx):
+                mag = spec[idx]
                 speed = 4 + mag * 10
-                vx = math.cos(angle) * speed
-                vy = math.sin(angle) * speed
-                color = (random.randint(200,255), random.randint(100,230), random.randint(120,255))
-                self._particles.append([
-                    center[0], center[1], vx, vy, color, 30 + int(mag*30)
-                ])
+                colors = np.stack((self._rng.integers(200, 256, len(idx), dtype=np.uint8),
+                                   self._rng.integers(100, 231, len(idx), dtype=np.uint8),
+                                   self._rng.integers(120, 256, len(idx), dtype=np.uint8)), axis=1)
+                self._spawn_particles(center, cs[idx] * speed, sn[idx] * speed, colors, 30 + (mag*30).astype(np.int32))
             # spawn lasers on strong peaks
-            if mag > 0.9 and random.random() < 0.12:
-                angle = 2 * math.pi * i / n
-                x1 = center[0] + int((max_radius * 0.2) * math.cos(angle))
-                y1 = center[1] + int((max_radius * 0.2) * math.sin(angle))
-                x2 = center[0] + int((max_radius) * math.cos(angle))
-                y2 = center[1] + int((max_radius) * math.sin(angle))
+            idx = np.nonzero((spec > 0.9) & (self._rng.random(n, dtype=np.float32) < 0.12))[0]
+            if len(idx):
+                x1 = center[0] + ((max_radius * 0.2) * cs[idx]).astype(np.int32)
+                y1 = center[1] + ((max_radius * 0.2) * sn[idx]).astype(np.int32)
+                x2 = center[0] + (max_radius * cs[idx]).astype(np.int32)
+                y2 = center[1] + (max_radius * sn[idx]).astype(np.int32)
                 # color from current palette with slight variance
-                pal = self._palettes[self._palette_index]
-                base = pal[i % len(pal)]
-                color = (min(255, base[0] + random.randint(-30, 30)), min(255, base[1] + random.randint(-30, 30)), min(255, base[2] + random.randint(-30, 30)))
-                self._lasers.append([x1, y1, x2, y2, math.cos(angle)*6, math.sin(angle)*6, color, 25])
-        # Mid-energy driven particle burst (adds movement related to rhythm)
-        spawn_mid = int(2 + mid_norm * 28)
-        for _ in range(spawn_mid):
-            a = random.random() * math.tau
+                pal, pal_lut = self._palette_lut(n)
+                base = pal[pal_lut[idx]]
+                colors = np.minimum(255, base + self._rng.integers(-30, 31, (len(idx), 3), dtype=np.int16))
+                self._spawn_lasers(x1, y1, x2, y2, cs[idx] * 6, sn[idx] * 6, colors, np.full(len(idx), 25, dtype=np.float32))
+            # Mid-energy driven particle burst (adds movement related to rhythm)
+            spawn_mid = int(2 + mid_norm * 28)
             speed = 2 + mid_norm * 12
-            vx = math.cos(a) * speed
-            vy = math.sin(a) * speed
+            angs = self._rng.random(spawn_mid, dtype=np.float32) * np.float32(math.tau)
             color = (200 + int(55 * high_norm), 120 + int(100 * mid_norm), 180 + int(60 * high_norm))
-            self._particles.append([center[0], center[1], vx, vy, color, 25 + int(mid_norm*40)])
-
-        # Met à jour et dessine les particules
-        new_particles = []
-        for p in self._particles:
-            p[0] += p[2]
-            p[1] += p[3]
-            p[5] -= 1
-            if 0 <= p[0] < self.width and 0 <= p[1] < self.height and p[5] > 0:
-                pygame.draw.circle(screen, p[4], (int(p[0]), int(p[1])), 3)
-                new_particles.append(p)
-        self._particles = new_particles
+            self._spawn_particles(center, np.cos(angs) * speed, np.sin(angs) * speed, color, 25 + int(mid_norm*40))
+
+        # Met à jour et dessine les particules (vectorized over live slots)
+        c = self._pcount
+        if c:
+            px, py = self._px[:c], self._py[:c]
+            px += self._pvx[:c]
+            py += self._pvy[:c]
+            self._plife[:c] -= 1
+            alive = (self._plife[:c] > 0) & (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+            # compact survivors to the front of the buffers
+            keep = np.nonzero(alive)[0]
+            c = len(keep)
+            for arr in (self._px, self._py, self._pvx, self._pvy, self._plife, self._pcolor):
+                arr[:c] = arr[keep]
+            self._pcount = c
+            pts = np.stack((self._px[:c], self._py[:c]), axis=1).astype(np.int32).tolist()
+            for pt, col in zip(pts, self._pcolor[:c].tolist()):
+                pygame.draw.circle(screen, col, pt, 3)
 
         # Met à jour et dessine les lasers
-        new_lasers = []
-        for L in self._lasers:
+        c = self._lcount
+        if c:
             # update position & life
-            L[0] += L[4]
-            L[1] += L[5]
-            L[2] += L[4]
-            L[3] += L[5]
-            L[7] -= 1
-            # render a glowy laser with multiple stacked strokes for bloom
-            self._render_laser(screen, L)
-            if -200 < L[0] < self.width + 200 and -200 < L[1] < self.height + 200 and L[7] > 0:
-                new_lasers.append(L)
-        self._lasers = new_lasers
+            self._lx1[:c] += self._lvx[:c]
+            self._ly1[:c] += self._lvy[:c]
+            self._lx2[:c] += self._lvx[:c]
+            self._ly2[:c] += self._lvy[:c]
+            self._llife[:c] -= 1
+            # render glowy lasers with stacked strokes for bloom
+            self._render_lasers(screen)
+            lx1, ly1 = self._lx1[:c], self._ly1[:c]
+            alive = ((self._llife[:c] > 0) & (lx1 > -200) & (lx1 < self.width + 200)
+                     & (ly1 > -200) & (ly1 < self.height + 200))
+            keep = np.nonzero(alive)[0]
+            c = len(keep)
+            for arr in (self._lx1, self._ly1, self._lx2, self._ly2, self._lvx, self._lvy, self._llife, self._lcolor):
+                arr[:c] = arr[keep]
+            self._lcount = c
 
         # Glitch effect occasionally (slice shifts)
         # glitch probability increased by high-frequency energy
         glitch_prob = min(0.02 + rms * 0.15 + high_norm * 0.45, 0.6)
-        if self._glitch_timer <= 0 and random.random() < glitch_prob:
+        if self._glitch_timer <= 0 and self._rand() < glitch_prob:
             self._glitch_timer = 6 + int(rms * 25 + high_norm * 30)
         if self._glitch_timer > 0:
             self._glitch_timer -= 1
-            temp = screen.copy()
+            # shift row slices in place on the pixel buffer (x, y, rgb)
+            arr = pygame.surfarray.pixels3d(screen)
             for _ in range(6):
-                h = random.randint(4, max(6, self.height//8))
-                y0 = random.randint(0, max(0, self.height - h))
-                shift = random.randint(-40, 40)
-                rect = pygame.Rect(0, y0, self.width, h)
-                slice_surf = temp.subsurface(rect).copy()
-                screen.blit(slice_surf, (shift, y0))
-                if random.random() < 0.4:
-                    rsurf = slice_surf.copy()
-                    rsurf.fill((255,0,0,80), special_flags=pygame.BLEND_RGBA_MULT)
-                    screen.blit(rsurf, (shift//2, y0))
+                h = self._randint(4, max(6, self.height//8))
+                y0 = self._randint(0, max(0, self.height - h))
+                shift = self._randint(-40, 40)
+                rows = arr[:, y0:y0 + h]
+                if self._rand() < 0.4:
+                    # red-only copy of the slice, offset by half the shift
+                    rows[...] = np.roll(rows, shift // 2, axis=0)
+                    rows[:, :, 1:] = 0
+                else:
+                    rows[...] = np.roll(rows, shift, axis=0)
+            # release the surface lock before blitting
+            del arr, rows
 
             # random glitch shapes / filters when enabled
             if self._glitch_enabled:
                 pal = self._palettes[self._palette_index]
                 shape_count = 2 + int(high_norm * 10)
                 for _ in range(shape_count):
-                    sx = random.randint(0, self.width)
-                    sy = random.randint(0, self.height)
-                    sw = random.randint(20, min(self.width//2, 200))
-                    sh = random.randint(20, min(self.height//2, 200))
-                    color = pal[random.randint(0, len(pal)-1)]
-                    alpha = 40 + int(200 * random.random() * high_norm)
+                    sx = self._randint(0, self.width)
+                    sy = self._randint(0, self.height)
+                    sw = self._randint(20, min(self.width//2, 200))
+                    sh = self._randint(20, min(self.height//2, 200))
+                    color = pal[self._randint(0, len(pal)-1)]
+                    alpha = 40 + int(200 * self._rand() * high_norm)
                     s = pygame.Surface((sw, sh), pygame.SRCALPHA)
                     # draw random rectangle or circle
-                    if random.random() < 0.5:
+                    if self._rand() < 0.5:
                         s.fill((color[0], color[1], color[2], alpha))
                     else:
                         pygame.draw.ellipse(s, (color[0], color[1], color[2], alpha), s.get_rect())
-                    blend = pygame.BLEND_RGBA_ADD if random.random() < 0.6 else 0
+                    blend = pygame.BLEND_RGBA_ADD if self._rand() < 0.6 else 0
                     screen.blit(s, (sx - sw//2, sy - sh//2), special_flags=blend)
 
         # --- VISU RADIAL (amélioré, plus épais, couleurs dynamiques) ---
-        for i in range(n):
-            angle = 2 * math.pi * i / n
-            mag = float(spec[i])
-            inner = int(60 + (max_radius * 0.2))
-            outer = int(inner + mag * (max_radius - inner))
-            x1 = center[0] + int(inner * math.cos(angle))
-            y1 = center[1] + int(inner * math.sin(angle))
-            x2 = center[0] + int(outer * math.cos(angle))
-            y2 = center[1] + int(outer * math.sin(angle))
-            # Couleur dynamique selon l'angle et l'énergie
-            hue = (self._bg_phase + angle/(2*math.pi)) % 1.0
-            col = (
-                min(255, int(120 + mag * 135 + 100 * abs(math.sin(hue * math.pi)))),
-                min(255, int(30 + mag * 180 + 80 * abs(math.sin((hue+0.33) * math.pi)))),
-                min(255, int(100 + mag * 155 + 80 * abs(math.sin((hue+0.66) * math.pi))))
-            )
-            pygame.draw.line(screen, col, (x1, y1), (x2, y2), 4)
+        # endpoints and colors for all bins in one vectorized pass
+        inner = int(60 + (max_radius * 0.2))
+        outer = (inner + spec * (max_radius - inner)).astype(np.int32)
+        x1 = center[0] + (inner * cs).astype(np.int32)
+        y1 = center[1] + (inner * sn).astype(np.int32)
+        x2 = center[0] + (outer * cs).astype(np.int32)
+        y2 = center[1] + (outer * sn).astype(np.int32)
+        # Couleur dynamique selon l'angle et l'énergie
+        hue = (self._bg_phase + np.arange(n, dtype=np.float32) / n) % 1.0
+        cr = np.minimum(255, (120 + spec * 135 + 100 * np.abs(np.sin(hue * np.pi))).astype(np.int32))
+        cg = np.minimum(255, (30 + spec * 180 + 80 * np.abs(np.sin((hue + 0.33) * np.pi))).astype(np.int32))
+        cb = np.minimum(255, (100 + spec * 155 + 80 * np.abs(np.sin((hue + 0.66) * np.pi))).astype(np.int32))
+        segs = np.stack((x1, y1, x2, y2, cr, cg, cb), axis=1).tolist()
+        for sx1, sy1, sx2, sy2, r, g, b in segs:
+            pygame.draw.line(screen, (r, g, b), (sx1, sy1), (sx2, sy2), 4)
 
         # Text overlay removed per user request; visuals use scenes and shapes instead.
 
-        # scanlines overlay
-        sl = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+        # scanlines overlay (static, built once in _init_surfaces)
+        screen.blit(self._scanlines_surf, (0,0))
+
+        # keep the frame that the quiet fast path will repeat
+        if self._quiet_frames:
+            if self._last_frame is None:
+                self._last_frame = screen.copy()
+            else:
+                self._last_frame.blit(screen, (0, 0))
+
+        pygame.display.flip()
+
+    def _init_surfaces(self):
+        """Allocate the overlay surfaces reused by _draw (after pygame.init)."""
+        size = (self.width, self.height)
+        self._tint_surf = pygame.Surface(size, pygame.SRCALPHA)
+        self._glow_surf = pygame.Surface(size, pygame.SRCALPHA)
+        self._glow_surf.fill((0, 0, 0, 0))
+        # the scanlines pattern never changes: build it once
+        sl = pygame.Surface(size, pygame.SRCALPHA)
+        sl.fill((0, 0, 0, 0))
         for y in range(0, self.height, 4):
             alpha = 10 if (y//4) % 2 == 0 else 4
             sl.fill((0,0,0,alpha), rect=pygame.Rect(0, y, self.width, 2))
-        screen.blit(sl, (0,0))
+        self._scanlines_surf = sl
 
-        pygame.display.flip()
+    def _spawn_particles(self, origin, vx, vy, color, life):
+        """Append particles starting at `origin` to the SoA buffers.
+
+        vx/vy are sequences; color ((3,) or (k, 3)) and life broadcast
+        against them. Particles beyond `_max_particles` are dropped.
+        """
+        vx = np.asarray(vx, dtype=np.float32)
+        k = min(len(vx), self._max_particles - self._pcount)
+        if k <= 0:
+            return
+        m = len(vx)
+        sl = slice(self._pcount, self._pcount + k)
+        self._px[sl] = origin[0]
+        self._py[sl] = origin[1]
+        self._pvx[sl] = vx[:k]
+        self._pvy[sl] = np.broadcast_to(np.asarray(vy, dtype=np.float32), (m,))[:k]
+        self._plife[sl] = np.broadcast_to(np.asarray(life, dtype=np.float32), (m,))[:k]
+        self._pcolor[sl] = np.broadcast_to(np.asarray(color, dtype=np.uint8), (m, 3))[:k]
+        self._pcount += k
+
+    def _spawn_lasers(self, x1, y1, x2, y2, vx, vy, color, life):
+        """Append lasers to the SoA buffers.
+
+        Every field is a sequence of the same length; colors are clamped to
+        0..255. Lasers beyond `_max_lasers` are dropped.
+        """
+        k = min(len(x1), self._max_lasers - self._lcount)
+        if k <= 0:
+            return
+        sl = slice(self._lcount, self._lcount + k)
+        for arr, v in ((self._lx1, x1), (self._ly1, y1), (self._lx2, x2), (self._ly2, y2),
+                       (self._lvx, vx), (self._lvy, vy), (self._llife, life)):
+            arr[sl] = np.asarray(v, dtype=np.float32)[:k]
+        self._lcolor[sl] = np.clip(np.asarray(color)[:k], 0, 255)
+        self._lcount += k
+
+    def _rotozoom_bg(self, idx: int, angle: float, zoom: float):
+        """Return background `idx` rotated/zoomed, memoized per 4° / 0.02 zoom step."""
+        a = round(angle / 4) * 4
+        z = round(zoom * 50)
+        key = (idx, a, z)
+        surf = self._rotozoom_cache.get(key)
+        if surf is None:
+            surf = pygame.transform.rotozoom(self._bg_surfaces[idx], a, z / 50.0)
+            if len(self._rotozoom_cache) >= self._rotozoom_cache_size:
+                # evict the oldest entry (dicts keep insertion order)
+                del self._rotozoom_cache[next(iter(self._rotozoom_cache))]
+            self._rotozoom_cache[key] = surf
+        return surf
+
+    def _rand(self) -> float:
+        """Uniform float in [0, 1) taken from a batch drawn with `self._rng`."""
+        i = self._rand_idx
+        if i >= len(self._rand_pool):
+            self._rand_pool = self._rng.random(256).tolist()
+            i = 0
+        self._rand_idx = i + 1
+        return self._rand_pool[i]
+
+    def _randint(self, a: int, b: int) -> int:
+        """Integer in [a, b] (inclusive, like random.randint) from the pool."""
+        return a + int(self._rand() * (b - a + 1))
+
+    def _palette_lut(self, n: int):
+        """Return (palette as int16 array, bin -> palette entry index) for n bins.
+
+        Rebuilt only when n or the current palette changes.
+        """
+        key = (n, self._palette_index)
+        if self._pal_lut is None or self._pal_lut[0] != key:
+            pal = np.array(self._palettes[self._palette_index], dtype=np.int16)
+            self._pal_lut = (key, pal, np.arange(n) % len(pal))
+        return self._pal_lut[1], self._pal_lut[2]
+
+    def _trig(self, n: int):
+        """Return cached (cos, sin) float32 tables for n evenly spaced angles."""
+        cs = self._trig_cache.get(n)
+        if cs is None:
+            angles = np.arange(n, dtype=np.float32) * np.float32(2 * np.pi / n)
+            cs = (np.cos(angles), np.sin(angles))
+            self._trig_cache[n] = cs
+        return cs
 
     def _make_bg(self, seed_index: int):
         """Create a procedural background surface (called after pygame.init).
 
         Uses different patterns depending on seed_index to provide variety.
         """
-        import pygame
-        import random
-        random.seed(seed_index + 7)
+        rng = np.random.default_rng(seed_index + 7)
         surf = pygame.Surface((self.width, self.height)).convert_alpha()
         # base radial
         cx, cy = self.width // 2, self.height // 2
@@ -357,100 +586,76 @@ class VisualGUI:
             b = int(40 + 200 * frac * abs(math.sin((hue+0.66) * math.pi)))
             pygame.draw.circle(surf, (r, g, b, 140), (cx, cy), int(max_r * frac))
 
-        # add some radial streaks
-        for t in range(40):
-            a = random.random() * math.tau
-            rr = random.randint(int(max_r*0.3), max_r)
-            x2 = cx + int(math.cos(a) * rr)
-            y2 = cy + int(math.sin(a) * rr)
-            col = (random.randint(80,200), random.randint(40,180), random.randint(80,240), 30)
-            pygame.draw.line(surf, col, (cx, cy), (x2, y2), random.randint(1,3))
-
-        # overlay some soft noise (random small circles)
-        for _ in range(800):
-            x = random.randrange(0, self.width)
-            y = random.randrange(0, self.height)
-            rr = random.randint(1, 3)
-            c = (random.randint(0,60), random.randint(0,60), random.randint(0,60), 15)
-            pygame.draw.circle(surf, c, (x, y), rr)
-
-        # slight vignette
-        vign = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        for i in range(100):
-            a = int(200 * (i / 100.0))
-            pygame.draw.circle(vign, (0, 0, 0, a//20), (cx, cy), int(max_r * (i/100.0)))
-        surf.blit(vign, (0,0), special_flags=pygame.BLEND_RGBA_SUB)
+        # add some radial streaks (endpoints, colors and widths drawn in one batch)
+        angs = rng.random(40) * math.tau
+        rr = rng.integers(int(max_r*0.3), max_r + 1, 40)
+        x2 = cx + (np.cos(angs) * rr).astype(np.int32)
+        y2 = cy + (np.sin(angs) * rr).astype(np.int32)
+        cols = np.stack((rng.integers(80, 201, 40), rng.integers(40, 181, 40),
+                         rng.integers(80, 241, 40), np.full(40, 30)), axis=1)
+        widths = rng.integers(1, 4, 40)
+        for ex, ey, col, w in zip(x2.tolist(), y2.tolist(), cols.tolist(), widths.tolist()):
+            pygame.draw.line(surf, col, (cx, cy), (ex, ey), w)
+
+        # overlay some soft noise: ~2.5% of the pixels (about what 800 small
+        # circles covered) become dark, nearly transparent specks
+        noise = rng.random((self.width, self.height), dtype=np.float32) < 0.025
+        rgb = pygame.surfarray.pixels3d(surf)
+        rgb[noise] = rng.integers(0, 61, (int(noise.sum()), 3), dtype=np.uint8)
+        del rgb
+        alpha = pygame.surfarray.pixels_alpha(surf)
+        alpha[noise] = 15
+
+        # slight vignette: alpha reduced by up to 9, growing with the distance
+        # to the centre (surfarray axes are x, y)
+        xx, yy = np.ogrid[:self.width, :self.height]
+        dist = np.hypot(xx - cx, yy - cy) / max_r
+        vign = np.where(dist < 0.99, dist * 10, 0).astype(np.uint8)
+        alpha -= np.minimum(alpha, vign)
+        del alpha
         return surf
 
-    def _render_laser(self, screen, laser):
-        """Render a laser with glow layers. laser: [x1,y1,x2,y2, vx, vy, color, life]"""
-        import pygame
-        x1, y1, x2, y2, vx, vy, color, life = laser
+    def _render_lasers(self, screen):
+        """Render the live lasers with glow layers.
+
+        Each glow layer is drawn for every laser on the shared glow surface,
+        which is then added to the screen in a single blit.
+        """
+        c = self._lcount
         # intensity scales with life and laser_vis
-        t = max(0.2, min(1.0, life / 40.0)) * self._laser_vis
-        base_w = int(2 + 6 * t)
-        # glow layers (outer -> inner)
-        glow_colors = [
-            (min(255, int(color[0]*0.6)), min(255, int(color[1]*0.6)), min(255, int(color[2]*0.6)), int(40 * t)),
-            (min(255, int(color[0]*0.9)), min(255, int(color[1]*0.9)), min(255, int(color[2]*0.9)), int(80 * t)),
-        ]
-        # helper to coerce any color-like input to an RGB tuple (r,g,b) and alpha
-        def _coerce_color(col, default=(255, 255, 255)):
-            try:
-                if col is None:
-                    return default, 255
-                # if it's a sequence (tuple/list/ndarray)
-                if hasattr(col, '__len__'):
-                    if len(col) >= 3:
-                        r = int(col[0])
-                        g = int(col[1])
-                        b = int(col[2])
-                        a = int(col[3]) if len(col) >= 4 else 255
-                        r = max(0, min(255, r))
-                        g = max(0, min(255, g))
-                        b = max(0, min(255, b))
-                        a = max(0, min(255, a))
-                        return (r, g, b), a
-                # single numeric grayscale
-                v = int(col)
-                v = max(0, min(255, v))
-                return (v, v, v), 255
-            except Exception:
-                return default, 255
-
-        # draw outer glows with additive blending, using safe color coercion
-        for i, gc in enumerate(glow_colors):
-            surf = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-            w = base_w + (6 - i*3)
-            (r, g, b), a = _coerce_color(gc)
-            try:
-                pygame.draw.line(surf, (r, g, b), (int(x1), int(y1)), (int(x2), int(y2)), max(1, w))
-            except Exception:
-                # fallback: draw a thinner white line if color failed
-                pygame.draw.line(surf, (255, 255, 255), (int(x1), int(y1)), (int(x2), int(y2)), max(1, w))
-            if a < 255:
-                try:
-                    surf.set_alpha(int(a))
-                except Exception:
-                    pass
-            screen.blit(surf, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-
-        # core bright line (ensure color is valid RGB)
-        rgb_color, _ = _coerce_color(color, default=(255, 255, 200))
-        pygame.draw.line(screen, rgb_color, (int(x1), int(y1)), (int(x2), int(y2)), max(1, base_w // 2))
-        # end caps
-        pygame.draw.circle(screen, rgb_color, (int(x2), int(y2)), max(2, base_w // 2))
+        t = np.clip(self._llife[:c] / 40.0, 0.2, 1.0) * self._laser_vis
+        base_w = (2 + 6 * t).astype(np.int32)
+        p1 = np.stack((self._lx1[:c], self._ly1[:c]), axis=1).astype(np.int32).tolist()
+        p2 = np.stack((self._lx2[:c], self._ly2[:c]), axis=1).astype(np.int32).tolist()
+        colors = self._lcolor[:c]
+
+        # glow layers (outer -> inner) with additive blending
+        glow = self._glow_surf
+        for i, k in enumerate((0.6, 0.9)):
+            widths = np.maximum(1, base_w + (6 - i*3)).tolist()
+            glow_cols = (colors * np.float32(k)).astype(np.int32).tolist()
+            for a, b, col, w in zip(p1, p2, glow_cols, widths):
+                pygame.draw.line(glow, col, a, b, w)
+            screen.blit(glow, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
+            glow.fill((0, 0, 0, 0))
+
+        core_w = np.maximum(1, base_w // 2).tolist()
+        cap_r = np.maximum(2, base_w // 2).tolist()
+        for a, b, col, w, r in zip(p1, p2, colors.tolist(), core_w, cap_r):
+            # core bright line
+            pygame.draw.line(screen, col, a, b, w)
+            # end caps
+            pygame.draw.circle(screen, col, b, r)
 
     def run(self):
-        try:
-            import pygame
-        except Exception as e:
-            raise RuntimeError(f"pygame requis pour la GUI: {e}")
+        if pygame is None:
+            raise RuntimeError(f"pygame requis pour la GUI: {_pygame_import_err}")
 
         pygame.init()
         screen = pygame.display.set_mode((self.width, self.height))
         pygame.display.set_caption(self.title)
         clock = pygame.time.Clock()
+        self._init_surfaces()
 
         # create procedural backgrounds now that pygame is initialized
         try:
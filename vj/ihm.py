@@ -5,7 +5,6 @@ le blocksize, la fréquence d'échantillonnage, etc. Retourne un dict de config.
 """
 import os
 from typing import Optional
-import queue
 import threading
 import math
 import time
@@ -21,6 +20,17 @@ try:
 except Exception:
     sd = None
 
+# numpy is optional for the level meter (pure-Python fallback otherwise);
+# imported once here rather than inside the audio callback
+try:
+    import numpy as _np
+    _HAS_NP = True
+except Exception:
+    _np = None
+    _HAS_NP = False
+
+from .config import device_labels, invalidate_devices, list_devices
+
 def select_config(devices, default_blocksize=1024, default_samplerate=None):
     """Affiche une IHM tkinter pour choisir les paramètres. Retourne un dict."""
     if tk is None:
@@ -44,16 +54,55 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
         'glitch_enabled': True,
     }
 
+    # device lookups, computed once per device list (updated in place by the
+    # refresh button): the provided (output) devices by PortAudio index, and
+    # the monitor / input candidates among all devices (from the cached
+    # config enumeration) used to map an output to a capture
+    devices_by_idx = {}
+    monitor_devs = []
+    input_devs = []
+
+    def load_devices(devs):
+        devices_by_idx.clear()
+        devices_by_idx.update({d.get('_pa_index', i): d for i, d in enumerate(devs)})
+        try:
+            all_devs = list_devices(outputs_only=False)
+        except Exception:
+            all_devs = []
+        all_names = [(j, (dd.get('name') or '').lower()) for j, dd in enumerate(all_devs)]
+        monitor_devs[:] = [(j, nm) for j, nm in all_names if 'monitor' in nm]
+        input_devs[:] = [(j, nm) for j, nm in all_names if all_devs[j].get('max_input_channels', 0) > 0]
+
+    load_devices(devices)
+
     # Périphérique (affiche par défaut les périphériques de sortie)
     tk.Label(root, text="Périphérique de sortie audio :").pack(anchor='w', padx=10, pady=(18,0))
     dev_var = tk.StringVar(value='default')
-    # devices may be a filtered list; use the original PortAudio index if present
-    dev_names = []
-    for i, d in enumerate(devices):
-        pa_idx = d.get('_pa_index', i)
-        dev_names.append(f"{pa_idx}: {d['name']} (in={d['max_input_channels']}, out={d['max_output_channels']})")
-    dev_menu = tk.OptionMenu(root, dev_var, 'default', *dev_names)
-    dev_menu.pack(anchor='w', padx=10)
+    # labels come from the same `devices` list as devices_by_idx, formatted
+    # once (original PortAudio index if present)
+    dev_names = device_labels(devices)
+    dev_frame = tk.Frame(root)
+    dev_frame.pack(anchor='w', padx=10)
+    dev_menu = tk.OptionMenu(dev_frame, dev_var, 'default', *dev_names)
+    dev_menu.pack(side='left')
+
+    def refresh_devices():
+        # hotplug: drop the cached enumeration and re-list output devices
+        invalidate_devices()
+        try:
+            devs = list_devices()
+        except Exception:
+            return
+        load_devices(devs)
+        labels = ['default'] + device_labels(devs)
+        menu = dev_menu['menu']
+        menu.delete(0, 'end')
+        for label in labels:
+            menu.add_command(label=label, command=tk._setit(dev_var, label))
+        if dev_var.get() not in labels:
+            dev_var.set('default')
+
+    tk.Button(dev_frame, text='Rafraîchir', command=refresh_devices).pack(side='left', padx=(8,0))
     
     # Small live level meter (shows input level for the selected device)
     meter_frame = tk.Frame(root)
@@ -66,35 +115,33 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
     meter_text.pack(side='left', padx=(8,0))
 
     # meter internals
-    meter_q = queue.Queue()
+    # latest RMS from the audio callback (single slot, no lock: a plain
+    # reference store is atomic; None = nothing new since the last poll)
+    meter_val = [None]
+    # last value drawn on the meter (-1: force the next redraw)
+    last_drawn = [-1.0]
     meter_stream = {'obj': None}
     meter_after_id = {'id': None}
+    # pending debounced device switch (see on_device_change)
+    device_after_id = {'id': None}
     meter_sim = {'thread': None, 'running': False}
 
     def audio_callback(indata, frames, time_info, status):
-        # compute RMS of first channel, push to queue
+        # compute RMS of first channel, publish it in the single slot
         try:
-            # prefer numpy if available for speed
-            import numpy as _np
-            data = _np.asarray(indata[:, 0], dtype=_np.float32)
-            rms = float(_np.sqrt((_np.square(data)).mean()))
-        except Exception:
-            try:
+            if _HAS_NP:
+                data = _np.asarray(indata[:, 0], dtype=_np.float32)
+                rms = float(_np.sqrt(_np.dot(data, data) / max(1, len(data))))
+            else:
                 # fallback: Python loop
                 arr = [float(x[0]) for x in indata]
                 s = 0.0
                 for v in arr:
                     s += v * v
                 rms = math.sqrt(s / max(1, len(arr)))
-            except Exception:
-                return
-        try:
-            # keep only the latest value
-            while not meter_q.empty():
-                meter_q.get_nowait()
-            meter_q.put_nowait(rms)
         except Exception:
-            pass
+            return
+        meter_val[0] = rms
 
     def start_meter_for_device(dev_idx):
         # stop existing
@@ -124,12 +171,7 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
             while meter_sim['running']:
                 # produce a varying RMS-like value
                 v = random.random() * 0.12
-                try:
-                    while not meter_q.empty():
-                        meter_q.get_nowait()
-                    meter_q.put_nowait(v)
-                except Exception:
-                    pass
+                meter_val[0] = v
                 time.sleep(0.06)
 
         t = threading.Thread(target=run_sim, daemon=True)
@@ -155,6 +197,8 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
             except Exception:
                 pass
         meter_stream['obj'] = None
+        # the status text is about to change: redraw the next value
+        last_drawn[0] = -1.0
         # cancel after callback if scheduled
         aid = meter_after_id.get('id')
         if aid is not None:
@@ -165,14 +209,13 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
             meter_after_id['id'] = None
 
     def update_meter():
-        # poll queue for latest rms
-        val = None
-        try:
-            while True:
-                val = meter_q.get_nowait()
-        except Exception:
-            pass
-        if val is not None:
+        # take the latest rms (if any arrived since the last poll)
+        val = meter_val[0]
+        meter_val[0] = None
+        # Tk widget updates dominate the poll cost: skip them when the level
+        # barely moved since the last redraw
+        if val is not None and abs(val - last_drawn[0]) >= 0.005:
+            last_drawn[0] = val
             # scale: assume val in [0..1], map to canvas width
             w = int(min(1.0, val / 0.1) * 220)  # 0.1 RMS maps to full
             meter_canvas.coords(meter_bar, 0, 0, w, 20)
@@ -180,8 +223,24 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
         # schedule next poll
         meter_after_id['id'] = root.after(60, update_meter)
 
+    def cancel_device_change():
+        aid = device_after_id.get('id')
+        if aid is not None:
+            try:
+                root.after_cancel(aid)
+            except Exception:
+                pass
+            device_after_id['id'] = None
+
+    def apply_device_change(pa_idx):
+        device_after_id['id'] = None
+        start_meter_for_device(pa_idx)
+
     # when device selection changes, restart meter
     def on_device_change(*args):
+        # opening a PortAudio stream takes up to a few hundred ms: only
+        # (re)open it once the selection has been stable for 200 ms
+        cancel_device_change()
         sel = dev_var.get()
         if sel == 'default':
             # default -> let system choose (no specific device)
@@ -193,14 +252,10 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
         except Exception:
             pa_idx = None
         # find the selected device entry in the provided devices list
-        sel_dev = None
-        for d in devices:
-            if d.get('_pa_index', None) == pa_idx:
-                sel_dev = d
-                break
+        sel_dev = devices_by_idx.get(pa_idx)
         # if the selected output device also exposes input channels (monitor/loopback), start meter
         if sel_dev is not None and sel_dev.get('max_input_channels', 0) > 0:
-            start_meter_for_device(pa_idx)
+            device_after_id['id'] = root.after(200, apply_device_change, pa_idx)
         else:
             stop_meter()
             meter_text.config(text='no capture')
@@ -274,35 +329,27 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
             try:
                 if idx is not None:
                     # find selected device entry from provided list
-                    sel_dev = None
-                    for d in devices:
-                        if d.get('_pa_index', None) == idx:
-                            sel_dev = d
-                            break
+                    sel_dev = devices_by_idx.get(idx)
                     # if selected output has input channels, use it
                     if sel_dev is not None and sel_dev.get('max_input_channels', 0) > 0:
                         chosen_idx = idx
                     else:
                         # try to find monitor/input device by name
-                        if sd is not None:
-                            all_devs = sd.query_devices()
-                            name_lower = (sel_dev.get('name','') if sel_dev else '').lower()
-                            monitor_idx = None
-                            # heuristics: look for devices that contain 'monitor' and the output name
-                            for j, dd in enumerate(all_devs):
-                                nm = (dd.get('name') or '').lower()
-                                if 'monitor' in nm and (name_lower in nm or name_lower.split()[0] in nm):
+                        name_lower = (sel_dev.get('name','') if sel_dev else '').lower()
+                        monitor_idx = None
+                        # heuristics: look for devices that contain 'monitor' and the output name
+                        for j, nm in monitor_devs:
+                            if name_lower in nm or name_lower.split()[0] in nm:
+                                monitor_idx = j
+                                break
+                        # fallback: any device that is an input and whose name contains the output name
+                        if monitor_idx is None:
+                            for j, nm in input_devs:
+                                if name_lower in nm:
                                     monitor_idx = j
                                     break
-                            # fallback: any device that is an input and whose name contains the output name
-                            if monitor_idx is None:
-                                for j, dd in enumerate(all_devs):
-                                    nm = (dd.get('name') or '').lower()
-                                    if dd.get('max_input_channels', 0) > 0 and name_lower in nm:
-                                        monitor_idx = j
-                                        break
-                            if monitor_idx is not None:
-                                chosen_idx = monitor_idx
+                        if monitor_idx is not None:
+                            chosen_idx = monitor_idx
             except Exception:
                 # best-effort mapping: if anything fails, keep chosen_idx as idx
                 chosen_idx = idx
@@ -321,8 +368,9 @@ def select_config(devices, default_blocksize=1024, default_samplerate=None):
         result['secondary_color'] = getattr(btn_secondary, '_rgb', result['secondary_color'])
         result['bg_color'] = getattr(btn_bg, '_rgb', result['bg_color'])
         result['glitch_enabled'] = bool(glitch_var.get())
-        # stop meter stream before closing
+        # stop meter stream (and any pending switch) before closing
         try:
+            cancel_device_change()
             stop_meter()
         except Exception:
             pass
@@ -10,9 +10,8 @@ Notes:
 - Run with the runner `env_ia/run_vj.py`.
 """
 import argparse
+import functools
 import threading
-import queue
-import math
 import time
 from typing import Optional
 
@@ -35,9 +34,84 @@ except Exception as e:
     sf = None
     _sf_import_err = e
 
+# optional FFT backends for the fixed-size transform: a pyfftw plan built
+# once for blocksize, else scipy's pocketfft, else numpy.fft
+try:
+    import pyfftw
+except Exception:
+    pyfftw = None
+try:
+    import scipy.fft as _scipy_fft
+except Exception:
+    _scipy_fft = None
+
+# numba is optional: fuses downmix + window + RMS into one pass
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
 import pygame
 
 
+def _prep_mono_np(frame, win, out):
+    """Write frame*win into `out` and return the RMS of `frame`."""
+    np.multiply(frame, win, out=out)
+    return float(np.sqrt(np.dot(frame, frame) / len(frame)))
+
+
+def _prep_stereo_np(left, right, win, out):
+    """Downmix `left`/`right` to mono*win into `out`, return the mono RMS."""
+    np.add(left, right, out=out)
+    out *= 0.5
+    rms = float(np.sqrt(np.dot(out, out) / len(out)))
+    out *= win
+    return rms
+
+
+if njit is not None:
+    # as in core.py, a failure while decorating also falls back to NumPy
+    try:
+        @njit(cache=True, fastmath=True)
+        def _prep_mono(frame, win, out):
+            """Same as `_prep_mono_np`, in one pass over the buffer."""
+            n = frame.shape[0]
+            acc = 0.0
+            for i in range(n):
+                v = frame[i]
+                out[i] = v * win[i]
+                acc += v * v
+            return np.sqrt(acc / n)
+
+        @njit(cache=True, fastmath=True)
+        def _prep_stereo(left, right, win, out):
+            """Same as `_prep_stereo_np`, in one pass over the buffers."""
+            n = left.shape[0]
+            acc = 0.0
+            for i in range(n):
+                m = (left[i] + right[i]) * 0.5
+                out[i] = m * win[i]
+                acc += m * m
+            return np.sqrt(acc / n)
+
+        # compile now (or load from cache) so the audio thread never pays JIT cost
+        _w = np.zeros(1024, dtype=np.float32)
+        _prep_mono(_w, _w, np.empty_like(_w))
+        _prep_stereo(_w, _w, _w, np.empty_like(_w))
+        del _w
+    except Exception:
+        njit = None
+if njit is None:
+    _prep_mono = _prep_mono_np
+    _prep_stereo = _prep_stereo_np
+
+# number of blocks buffered between the file playback callback and the
+# analyzer thread (see AudioVisualizer._ring)
+_RING_SIZE = 8
+# number of log-spaced bands drawn (fewer after merging duplicate low bins)
+_N_BANDS = 64
+
+
 class AudioVisualizer:
     """Audio visualizer that can use a file or live microphone.
 
@@ -58,38 +132,165 @@ class AudioVisualizer:
         self.blocksize = blocksize
         self.samplerate = samplerate
 
-        self._spec_lock = threading.Lock()
-        self.latest_spectrum = np.zeros(blocksize // 2)
+        # latest_spectrum holds the normalized *power* spectrum (|X|^2 / max);
+        # _draw takes the square root on the values it displays.
+        # double-buffered spectrum: _analyze_frame fills the back buffer then
+        # swaps the latest_spectrum reference (atomic under the GIL), so the
+        # drawer reads the front buffer with neither lock nor copy
+        self._spec_bufs = (np.zeros(blocksize // 2, dtype=np.float32),
+                           np.zeros(blocksize // 2, dtype=np.float32))
+        self.latest_spectrum = self._spec_bufs[0]
         self.latest_rms = 0.0
-
-        # queue for audio frames when using file mode (producer -> callback)
-        # avoid using subscripted types like `queue.Queue[np.ndarray]` which
-        # require newer Python/typing features; use a plain annotation so the
-        # module can run in older interpreters inside the user's virtualenv.
-        self._file_q: queue.Queue = queue.Queue(maxsize=8)
+        # set when a spectrum is published, cleared when _draw picks it up:
+        # audio blocks arriving in between are not analyzed, since the draw
+        # loop (30 fps) would never show their result
+        self._spec_dirty = False
+        # HUD: font created on first draw (needs pygame.init), and the last
+        # rendered (text, surface) so unchanged text is not re-rasterized
+        self._font = None
+        self._hud = (None, None)
+        # the spectrum is drawn as log-spaced bands: start bin and width of
+        # each band (np.add.reduceat edges), fixed by blocksize
+        n_bins = blocksize // 2
+        edges = np.unique(np.logspace(0, np.log10(max(2, n_bins)), _N_BANDS).astype(np.intp))
+        self._band_edges = edges[edges < n_bins]
+        self._band_widths = np.diff(np.append(self._band_edges, n_bins)).astype(np.float32)
+        # bar angle tables, one bar per band
+        n_bars = len(self._band_edges)
+        angles = np.arange(n_bars, dtype=np.float32) * np.float32(2 * np.pi / max(1, n_bars))
+        self._cos = np.cos(angles)
+        self._sin = np.sin(angles)
+
+        # analysis window for the fixed blocksize, computed once; other
+        # lengths are cached lazily in _win_cache (see _get_window)
+        self._window = np.hanning(blocksize).astype(np.float32)
+        self._win_cache = {blocksize: self._window}
+        self._frame_buf = np.empty(blocksize, dtype=np.float32)
+        # mono downmix scratch for blocks with more than two channels
+        # (mono and stereo blocks go straight to _prep_mono/_prep_stereo)
+        self._mono = np.empty(blocksize, dtype=np.float32)
+        # with pyfftw, window straight into the plan's aligned input buffer
+        self._fft = None
+        if pyfftw is not None:
+            try:
+                fft_in = pyfftw.empty_aligned(blocksize, dtype="float32")
+                fft_out = pyfftw.empty_aligned(blocksize // 2 + 1, dtype="complex64")
+                self._fft = pyfftw.FFTW(fft_in, fft_out, flags=("FFTW_MEASURE",))
+                self._frame_buf = fft_in
+            except Exception:
+                self._fft = None
+        # rfft magnitude scratch (blocksize//2 + 1 bins)
+        self._mag_buf = np.empty(blocksize // 2 + 1, dtype=np.float32)
+
+        # file mode: single-producer/single-consumer ring of preallocated
+        # blocks between the playback callback and the analyzer thread. The
+        # callback copies into slot _ring_w % _RING_SIZE then bumps _ring_w
+        # (a plain int store): no lock nor allocation on the audio thread.
+        # Slots are channel-major (channels, blocksize), so each channel is
+        # contiguous for the downmix; they are allocated once the channel
+        # count is known.
+        self._ring = None
+        self._ring_w = 0
+
+        # FFT -> publish step for full blocks, specialized for blocksize
+        self._analyze_block = self._make_block_analyzer()
 
         # flag to stop threads/streams
         self._stop = threading.Event()
 
+    def _get_window(self, n: int) -> np.ndarray:
+        """Hann window of length `n`, computed once per length."""
+        win = self._win_cache.get(n)
+        if win is None:
+            win = self._win_cache[n] = np.hanning(n).astype(np.float32)
+        return win
+
     def _analyze_frame(self, frame: np.ndarray):
         # frame: shape (n, channels) or (n,) mono
+        if len(frame) == self.blocksize:
+            # full block: downmix, window and RMS in a single pass into the
+            # preallocated scratch (numba-compiled if available)
+            ch = frame.shape[1] if frame.ndim > 1 else 0
+            if ch == 2:
+                rms = float(_prep_stereo(frame[:, 0], frame[:, 1], self._window, self._frame_buf))
+            else:
+                if ch == 1:
+                    frame = frame[:, 0]
+                elif ch > 2:
+                    frame = np.mean(frame, axis=1, out=self._mono)
+                rms = float(_prep_mono(frame, self._window, self._frame_buf))
+            self._analyze_block(rms)
+            return
         if frame.ndim > 1:
             frame = np.mean(frame, axis=1)
-        # apply window
-        win = np.hanning(len(frame))
-        frame_win = frame * win
-        # FFT
-        spec = np.abs(np.fft.rfft(frame_win))
-        # normalize
-        spec = spec / (np.max(spec) + 1e-6)
+        cspec = np.fft.rfft(frame * self._get_window(len(frame)))
         rms = float(np.sqrt(np.mean(frame ** 2)))
-        with self._spec_lock:
-            # keep spectrum length consistent with blocksize/2
-            target_len = self.blocksize // 2
-            if len(spec) != target_len:
-                spec = np.resize(spec, target_len)
-            self.latest_spectrum = spec
+        self._publish(cspec, rms)
+
+    def _analyze_channels(self, chans: np.ndarray):
+        """Analyze a deinterleaved (channels, blocksize) block."""
+        if chans.shape[0] == 2:
+            rms = _prep_stereo(chans[0], chans[1], self._window, self._frame_buf)
+        else:
+            mono = chans[0] if chans.shape[0] == 1 else np.mean(chans, axis=0, out=self._mono)
+            rms = _prep_mono(mono, self._window, self._frame_buf)
+        self._analyze_block(float(rms))
+
+    def _make_block_analyzer(self):
+        """Build the FFT -> publish step for the windowed block in `_frame_buf`.
+
+        Same result as `_publish(rfft(_frame_buf), rms)`, but the FFT backend,
+        buffers, dtypes and lengths are resolved once for the fixed blocksize
+        and bound as closure locals: the per-block path has no branch on them.
+        """
+        frame_buf = self._frame_buf
+        if self._fft is not None:
+            fft = self._fft
+        elif _scipy_fft is not None:
+            fft = functools.partial(_scipy_fft.rfft, frame_buf, workers=1, overwrite_x=True)
+        else:
+            fft = functools.partial(np.fft.rfft, frame_buf)
+        # output precision depends on the backend and numpy version (numpy>=2
+        # keeps float32 input in complex64): probe it once
+        real = fft().real.dtype
+        mag = self._mag_buf
+        mag_out = mag[: self.blocksize // 2]
+        spec_a, spec_b = self._spec_bufs
+        einsum, f32 = np.einsum, np.float32
+
+        def analyze_block(rms):
+            pairs = fft().view(real).reshape(-1, 2)
+            einsum('ij,ij->i', pairs, pairs, out=mag, casting='same_kind')
+            np.multiply(mag, f32(1.0 / (float(mag.max()) + 1e-12)), out=mag)
+            buf = spec_b if self.latest_spectrum is spec_a else spec_a
+            buf[:] = mag_out
+            self.latest_spectrum = buf
             self.latest_rms = rms
+            self._spec_dirty = True
+
+        return analyze_block
+
+    def _publish(self, cspec, rms: float):
+        """Normalize the power of `cspec` and swap it in as latest_spectrum.
+
+        Generic path for short frames; full blocks use `_analyze_block`.
+        """
+        # squared magnitude re*re + im*im (no per-bin sqrt), computed on the
+        # (re, im) float pairs
+        pairs = cspec.view(cspec.real.dtype).reshape(-1, 2)
+        spec = np.einsum('ij,ij->i', pairs, pairs).astype(np.float32, copy=False)
+        # normalize: one multiply by the reciprocal instead of a division
+        spec *= np.float32(1.0 / (float(spec.max()) + 1e-12))
+        # keep spectrum length consistent with blocksize/2
+        target_len = self.blocksize // 2
+        if len(spec) < target_len:
+            spec = np.resize(spec, target_len)
+        a, b = self._spec_bufs
+        buf = b if self.latest_spectrum is a else a
+        buf[:] = spec[:target_len]
+        self.latest_spectrum = buf
+        self.latest_rms = rms
+        self._spec_dirty = True
 
     # ---------- File playback mode ----------
     def _file_playback_worker(self):
@@ -103,27 +304,29 @@ class AudioVisualizer:
         try:
             with sf.SoundFile(self.source, "r") as f:
                 samplerate = self.samplerate or f.samplerate
+                self._ring = [np.zeros((f.channels, self.blocksize), dtype=np.float32)
+                              for _ in range(_RING_SIZE)]
+                self._ring_w = 0
+                # the callback reads into this (frames, channels) buffer
+                # instead of letting f.read allocate a new array per period
+                read_buf = np.zeros((self.blocksize, f.channels), dtype=np.float32)
 
                 def callback(outdata, frames, time_info, status):
                     try:
-                        data = f.read(frames, dtype="float32")
-                        if len(data) == 0:
+                        out = read_buf[:frames]
+                        n = f.buffer_read_into(out, dtype="float32")
+                        if n == 0:
                             raise sd.CallbackStop()
-                        # if mono -> make sure outdata shape fits
-                        if data.ndim == 1:
-                            out = np.expand_dims(data, axis=1)
-                        else:
-                            out = data
                         # if fewer frames than requested, pad
-                        if out.shape[0] < frames:
-                            pad = np.zeros((frames - out.shape[0], out.shape[1]), dtype="float32")
-                            out = np.vstack((out, pad))
+                        if n < frames:
+                            out[n:] = 0
                         outdata[:] = out
-                        # also analyze chunk (use copy to avoid mutation)
-                        try:
-                            self._file_q.put_nowait(out.copy())
-                        except queue.Full:
-                            pass
+                        # publish the block to the analyzer ring
+                        if frames == self.blocksize:
+                            w = self._ring_w
+                            # deinterleave once (frames, ch) -> (ch, frames)
+                            np.copyto(self._ring[w % _RING_SIZE], out.T)
+                            self._ring_w = w + 1
                     except sd.CallbackStop:
                         raise
                     except Exception:
@@ -140,31 +343,39 @@ class AudioVisualizer:
             self._stop.set()
 
     def _file_analyzer_worker(self):
-        # consume from queue and analyze
+        # consume blocks from the ring and analyze
+        r = 0
+        frame = None
         while not self._stop.is_set():
-            try:
-                frame = self._file_q.get(timeout=0.2)
-            except queue.Empty:
+            ring = self._ring
+            w = self._ring_w
+            if ring is None or r >= w or self._spec_dirty:
+                time.sleep(0.005)
                 continue
-            # convert to mono and analyze
-            if frame.ndim > 1:
-                mono = np.mean(frame, axis=1)
-            else:
-                mono = frame
-            # if length mismatch, resample/truncate/pad
-            if len(mono) != self.blocksize:
-                if len(mono) > self.blocksize:
-                    mono = mono[: self.blocksize]
-                else:
-                    mono = np.pad(mono, (0, self.blocksize - len(mono)))
-            self._analyze_frame(mono)
+            # only the newest block matters (older ones were never drawn)
+            r = w - 1
+            if frame is None or frame.shape != ring[0].shape:
+                frame = np.empty_like(ring[0])
+            np.copyto(frame, ring[r % _RING_SIZE])
+            r += 1
+            if self._ring_w - r >= _RING_SIZE - 1:
+                # the writer may have reached this slot while copying: drop it
+                continue
+            self._analyze_channels(frame)
 
     # ---------- Microphone mode ----------
     def _mic_callback(self, indata, frames, time_info, status):
         if status:
             # print(status)
             pass
+        # the last spectrum has not been drawn yet: skip this block
+        if self._spec_dirty:
+            return
         try:
+            if frames == self.blocksize:
+                # _analyze_frame downmixes full blocks without allocating
+                self._analyze_frame(indata)
+                return
             if indata.ndim > 1:
                 mono = np.mean(indata, axis=1)
             else:
@@ -180,13 +391,17 @@ class AudioVisualizer:
 
     # ---------- Visuals (pygame) ----------
     def _draw(self, screen, width, height):
-        # get a copy of spectrum
-        with self._spec_lock:
-            spec = np.copy(self.latest_spectrum)
-            rms = float(self.latest_rms)
+        # clear the flag *before* taking the front buffer, so a spectrum
+        # published in between is the one drawn rather than dropped; the
+        # writer fills the other buffer, then waits for the next clear.
+        # Averaged into log-spaced bands, power -> magnitude on those only
+        self._spec_dirty = False
+        power = self.latest_spectrum
+        rms = float(self.latest_rms)
+        spec = np.sqrt(np.add.reduceat(power, self._band_edges) / self._band_widths)
 
         screen.fill((8, 8, 12))
-        # draw radial bands based on spectrum
+        # draw radial bands based on spectrum (one bar per band)
         n = len(spec)
         center = (width // 2, height // 2)
         max_radius = min(width, height) // 2 - 20
@@ -194,24 +409,38 @@ class AudioVisualizer:
         pulse = int(30 + min(200, rms * 2000))
         pygame.draw.circle(screen, (pulse, pulse // 2, pulse // 4), center, 40)
 
-        # draw frequency bars in a circular layout
-        for i in range(n):
-            angle = 2 * math.pi * i / n
-            mag = float(spec[i])
-            inner = int(60 + (max_radius * 0.2))
-            outer = int(inner + mag * (max_radius - inner))
-            x1 = center[0] + int(inner * math.cos(angle))
-            y1 = center[1] + int(inner * math.sin(angle))
-            x2 = center[0] + int(outer * math.cos(angle))
-            y2 = center[1] + int(outer * math.sin(angle))
-            # color gradient
-            col = (min(255, int(100 + mag * 155)), min(255, int(30 + mag * 120)), 200)
-            pygame.draw.line(screen, col, (x1, y1), (x2, y2), 2)
-
-        # small HUD
-        font = pygame.font.SysFont(None, 20)
-        txt = font.render(f"Source: {self.source or 'mic'}  RMS: {rms:.4f}", True, (200, 200, 200))
-        screen.blit(txt, (10, 10))
+        # draw frequency bars in a circular layout, rasterized straight into
+        # the pixel buffer: each bar is sampled at one-pixel radius steps
+        # (a DDA over all bars at once) instead of one draw.line call per bar
+        cs, sn = self._cos[:n], self._sin[:n]
+        inner = int(60 + (max_radius * 0.2))
+        outer = (inner + spec * (max_radius - inner)).astype(np.int32)
+        steps = int(outer.max()) - inner + 1 if n else 0
+        if steps > 0:
+            t = np.linspace(0.0, 1.0, steps, dtype=np.float32)
+            radii = inner + (outer - inner).astype(np.float32)[:, None] * t
+            xs = np.clip(center[0] + (radii * cs[:, None]).astype(np.int32), 0, width - 2)
+            ys = np.clip(center[1] + (radii * sn[:, None]).astype(np.int32), 0, height - 2)
+            # color gradient, one (r, g, b) per bar broadcast along its samples
+            cols = np.empty((n, 1, 3), dtype=np.uint8)
+            cols[:, 0, 0] = np.minimum(255, (100 + spec * 155).astype(np.int32))
+            cols[:, 0, 1] = np.minimum(255, (30 + spec * 120).astype(np.int32))
+            cols[:, 0, 2] = 200
+            cols = np.broadcast_to(cols, xs.shape + (3,))
+            arr = pygame.surfarray.pixels3d(screen)
+            # 2px thick bars
+            arr[xs, ys] = cols
+            arr[xs + 1, ys] = cols
+            arr[xs, ys + 1] = cols
+            del arr
+
+        # small HUD (3 decimals: finer RMS changes would re-render every frame)
+        text = f"Source: {self.source or 'mic'}  RMS: {rms:.3f}"
+        if text != self._hud[0]:
+            if self._font is None:
+                self._font = pygame.font.SysFont(None, 20)
+            self._hud = (text, self._font.render(text, True, (200, 200, 200)))
+        screen.blit(self._hud[1], (10, 10))
 
         pygame.display.flip()
 